@@ -0,0 +1,110 @@
+# jdgen/exports.py
+import csv
+import gzip
+import io
+import json
+import os
+
+from .models import JDRequest
+
+EXPORT_FIELDS = ("id", "created_at", "status", "language", "tone", "word_count", "input_json", "output_text", "error")
+EXPORT_FORMATS = ("ndjson", "csv")
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_jdrequest_chunks(after_id: int = 0, before_id=None, status=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Walk JDRequest in primary-key order using keyset ranges (`id > cursor LIMIT n`),
+    yielding lists of at most `chunk_size` row dicts. Only one chunk is held in
+    memory at a time, and the last `id` of a chunk is the cursor to resume from.
+    """
+    qs = JDRequest.objects.order_by("id")
+    if status:
+        qs = qs.filter(status=status)
+    if before_id:
+        qs = qs.filter(id__lt=before_id)
+
+    cursor = after_id or 0
+    while True:
+        rows = list(qs.filter(id__gt=cursor).values(*EXPORT_FIELDS)[:chunk_size])
+        if not rows:
+            return
+        for row in rows:
+            row["created_at"] = row["created_at"].isoformat() if row["created_at"] else None
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        cursor = rows[-1]["id"]
+
+
+def render_ndjson(rows) -> str:
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def render_csv(rows, include_header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if include_header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        # nested JSON is kept as a JSON string inside the cell
+        writer.writerow(
+            json.dumps(row[f], ensure_ascii=False) if f == "input_json" else row[f]
+            for f in EXPORT_FIELDS
+        )
+    return buffer.getvalue()
+
+
+def render_chunk(rows, export_format: str, first: bool = False, compress: bool = False) -> bytes:
+    """
+    Serialize one chunk. With `compress`, each chunk becomes its own gzip member;
+    concatenated members are still a valid .gz file, which keeps resumed exports
+    appendable.
+    """
+    if export_format == "csv":
+        text = render_csv(rows, include_header=first)
+    else:
+        text = render_ndjson(rows)
+    data = text.encode("utf-8")
+    return gzip.compress(data) if compress else data
+
+
+def stream_export(export_format: str = "ndjson", compress: bool = False, **chunk_kwargs):
+    """Yield encoded export bytes chunk by chunk (for StreamingHttpResponse)."""
+    for i, rows in enumerate(iter_jdrequest_chunks(**chunk_kwargs)):
+        yield render_chunk(rows, export_format, first=(i == 0), compress=compress)
+
+
+def write_parquet(path: str, **chunk_kwargs):
+    """
+    Write a columnar Parquet file, one row group per chunk. Requires pyarrow.
+    A Parquet file is only readable once its footer is written on close, so rows
+    go to `<path>.partial` first and the file is renamed into place when complete;
+    an interrupted export leaves no file at `path` and has to restart from its
+    starting cursor. Returns (rows_written, last_id).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("created_at", pa.string()),
+        ("status", pa.string()),
+        ("language", pa.string()),
+        ("tone", pa.string()),
+        ("word_count", pa.int32()),
+        ("input_json", pa.string()),
+        ("output_text", pa.string()),
+        ("error", pa.string()),
+    ])
+    partial = f"{path}.partial"
+    written, last_id = 0, None
+    with pq.ParquetWriter(partial, schema, compression="zstd") as writer:
+        for rows in iter_jdrequest_chunks(**chunk_kwargs):
+            for row in rows:
+                row["input_json"] = json.dumps(row["input_json"], ensure_ascii=False)
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            written += len(rows)
+            last_id = rows[-1]["id"]
+    os.replace(partial, path)
+    return written, last_id
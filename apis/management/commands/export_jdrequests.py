@@ -0,0 +1,118 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apis.exports import DEFAULT_CHUNK_SIZE, iter_jdrequest_chunks, render_chunk, write_parquet
+
+
+class Command(BaseCommand):
+    help = (
+        "Export JDRequest history as NDJSON, CSV or Parquet, walking the table in "
+        "keyset chunks so memory use stays flat. Use --cursor-file to make the export resumable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=("ndjson", "csv", "parquet"), default="ndjson")
+        parser.add_argument("--output", "-o", default="-", help="Output path, or '-' for stdout (not for parquet).")
+        parser.add_argument("--gzip", action="store_true", help="Gzip NDJSON/CSV output.")
+        parser.add_argument("--after-id", type=int, default=0, help="Export rows with id greater than this.")
+        parser.add_argument("--before-id", type=int, default=None, help="Export rows with id less than this.")
+        parser.add_argument("--status", default=None, help="Only export rows with this status.")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            "--cursor-file",
+            default=None,
+            help="Checkpoint file holding the last exported id (and output size for NDJSON/CSV). Read on "
+                 "start to resume. NDJSON/CSV checkpoint after every chunk and resume by cutting --output "
+                 "back to the checkpoint and appending; parquet checkpoints only once the file is complete "
+                 "and then writes newer rows to a new <output>.after-<id> file.",
+        )
+
+    def handle(self, *args, **options):
+        export_format = options["format"]
+        output = options["output"]
+        cursor_file = options["cursor_file"]
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        after_id = options["after_id"]
+        checkpoint = None
+        if cursor_file and os.path.exists(cursor_file) and not after_id:
+            checkpoint = self._load_cursor(cursor_file)
+            if checkpoint is not None:
+                after_id = checkpoint["last_id"]
+
+        chunk_kwargs = {
+            "after_id": after_id,
+            "before_id": options["before_id"],
+            "status": options["status"],
+            "chunk_size": options["chunk_size"],
+        }
+
+        if export_format == "parquet":
+            if output == "-":
+                raise CommandError("Parquet output needs a file path (--output).")
+            if checkpoint is not None:
+                # parquet files can't be appended to; write newer rows as a new part file
+                root, ext = os.path.splitext(output)
+                output = f"{root}.after-{after_id}{ext or '.parquet'}"
+                self.stderr.write(f"Resuming after id {after_id}; writing remaining rows to {output}.")
+            if os.path.exists(output):
+                raise CommandError(f"{output} already exists; refusing to overwrite it.")
+            try:
+                written, last_id = write_parquet(output, **chunk_kwargs)
+            except ImportError:
+                raise CommandError("Parquet export requires pyarrow (pip install pyarrow).")
+            if last_id is not None:
+                self._save_cursor(cursor_file, last_id)
+            self.stderr.write(self.style.SUCCESS(f"Exported {written} rows (last id: {last_id})."))
+            return
+
+        to_stdout = output == "-"
+        if to_stdout:
+            # write through self.stdout so call_command(stdout=...) can capture the export
+            stream = getattr(self.stdout._out, "buffer", self.stdout._out)
+        elif checkpoint is not None and checkpoint.get("offset") is not None and os.path.exists(output):
+            # drop anything written after the last checkpoint (e.g. a half-written chunk)
+            stream = open(output, "r+b")
+            stream.truncate(checkpoint["offset"])
+            stream.seek(checkpoint["offset"])
+        elif checkpoint is not None:
+            stream = open(output, "ab")
+        else:
+            stream = open(output, "wb")
+
+        resuming = checkpoint is not None
+        written, last_id = 0, None
+        try:
+            for i, rows in enumerate(iter_jdrequest_chunks(**chunk_kwargs)):
+                stream.write(render_chunk(rows, export_format, first=(i == 0 and not resuming), compress=options["gzip"]))
+                stream.flush()
+                written += len(rows)
+                last_id = rows[-1]["id"]
+                self._save_cursor(cursor_file, last_id, None if to_stdout else stream.tell())
+        finally:
+            if not to_stdout:
+                stream.close()
+
+        self.stderr.write(self.style.SUCCESS(f"Exported {written} rows (last id: {last_id})."))
+
+    def _load_cursor(self, cursor_file):
+        with open(cursor_file) as f:
+            saved = f.read().strip()
+        if not saved:
+            return None
+        try:
+            checkpoint = json.loads(saved)
+            return {"last_id": int(checkpoint["last_id"]), "offset": checkpoint.get("offset")}
+        except (ValueError, TypeError, KeyError):
+            raise CommandError(f"Unreadable cursor file {cursor_file}: {saved[:100]}")
+
+    def _save_cursor(self, cursor_file, last_id, offset=None):
+        if not cursor_file:
+            return
+        tmp = f"{cursor_file}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"last_id": last_id, "offset": offset}, f)
+        os.replace(tmp, cursor_file)
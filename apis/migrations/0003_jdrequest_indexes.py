@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apis", "0002_totalusage"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="jdrequest",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="jdrequest",
+            name="status",
+            field=models.CharField(db_index=True, default="pending", max_length=32),
+        ),
+    ]
@@ -0,0 +1,192 @@
+# jdgen/profiling.py
+import cProfile
+import contextvars
+import io
+import logging
+import pstats
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = ".prof"
+PROFILE_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]+\.prof$")
+
+_current_timing = contextvars.ContextVar("server_timing", default=None)
+
+# cProfile allows only one active profiler per process on Python >= 3.12
+_profiler_lock = threading.Lock()
+
+
+# config: set these in Django settings; read per call so override_settings applies
+def server_timing_enabled() -> bool:
+    return getattr(settings, "SERVER_TIMING_ENABLED", False)  # staff always get the header
+
+
+def profile_sample_rate() -> float:
+    return getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)  # 0.0 disables profiling
+
+
+def profile_threshold_ms() -> float:
+    return getattr(settings, "PROFILE_THRESHOLD_MS", 1000)
+
+
+def profile_dir() -> Path:
+    return Path(getattr(settings, "PROFILE_DIR", Path(settings.BASE_DIR) / "profiles"))
+
+
+def profile_max_files() -> int:
+    return getattr(settings, "PROFILE_MAX_FILES", 50)
+
+
+class ServerTiming:
+    """
+    Collects named spans (in milliseconds) for a single request and renders
+    them as a `Server-Timing` header value.
+    """
+
+    def __init__(self):
+        self.spans = []
+
+    def add(self, name: str, duration_ms: float):
+        self.spans.append((name, duration_ms))
+
+    def header_value(self) -> str:
+        return ", ".join(f"{name};dur={duration_ms:.2f}" for name, duration_ms in self.spans)
+
+
+@contextmanager
+def timing_span(name: str):
+    """
+    Time the wrapped block and record it on the current request's ServerTiming.
+    A no-op when called outside of ServerTimingMiddleware (e.g. management commands).
+    """
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, (time.perf_counter() - start) * 1000)
+
+
+def _stored_profiles():
+    """(path, stat) for every stored dump, skipping files pruned by another worker meanwhile."""
+    entries = []
+    for path in profile_dir().glob(f"*{PROFILE_SUFFIX}"):
+        try:
+            entries.append((path, path.stat()))
+        except FileNotFoundError:
+            continue
+    return entries
+
+
+def _prune_profiles():
+    """Keep only the newest PROFILE_MAX_FILES dumps (oldest are removed first)."""
+    entries = sorted(_stored_profiles(), key=lambda entry: (entry[1].st_mtime, entry[0].name))
+    for old, _ in entries[:max(0, len(entries) - profile_max_files())]:
+        try:
+            old.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def save_profile(profiler: cProfile.Profile, request, duration_ms: float) -> Path:
+    """Dump profiler stats into the on-disk ring and return the written path."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", request.path).strip("_") or "root"
+    name = f"{time.time_ns()}-{request.method.lower()}-{slug[:64]}-{int(duration_ms)}ms{PROFILE_SUFFIX}"
+    path = directory / name
+    profiler.dump_stats(str(path))
+    _prune_profiles()
+    return path
+
+
+def list_profiles():
+    """Return metadata for stored profiles, newest first."""
+    if not profile_dir().is_dir():
+        return []
+    entries = sorted(_stored_profiles(), key=lambda entry: (entry[1].st_mtime, entry[0].name), reverse=True)
+    return [
+        {"name": path.name, "size": stat.st_size, "created_at": stat.st_mtime}
+        for path, stat in entries
+    ]
+
+
+def get_profile_path(name: str):
+    """Resolve a stored profile by file name. Returns None for unknown or unsafe names."""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = profile_dir() / name
+    return path if path.is_file() else None
+
+
+def render_profile_text(path: Path, limit: int = 50) -> str:
+    """Human-readable pstats summary sorted by cumulative time."""
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a `Server-Timing` header with the spans recorded via `timing_span`
+    plus a `total` span, for staff users or everyone when SERVER_TIMING_ENABLED.
+    A PROFILE_SAMPLE_RATE fraction of requests runs under cProfile (one at a
+    time); those slower than PROFILE_THRESHOLD_MS are kept in PROFILE_DIR.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = ServerTiming()
+        token = _current_timing.set(timing)
+        profiler = None
+        sample_rate = profile_sample_rate()
+        if sample_rate and random.random() < sample_rate and _profiler_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError as e:
+                    # another profiling tool is active; serve the request unprofiled
+                    logger.warning("Could not start profiler: %s", e)
+                    _profiler_lock.release()
+                    profiler = None
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                    _profiler_lock.release()
+        finally:
+            _current_timing.reset(token)
+        duration_ms = (time.perf_counter() - start) * 1000
+        timing.add("total", duration_ms)
+
+        user = getattr(request, "user", None)
+        if server_timing_enabled() or getattr(user, "is_staff", False):
+            response["Server-Timing"] = timing.header_value()
+
+        if profiler is not None and duration_ms >= profile_threshold_ms():
+            try:
+                save_profile(profiler, request, duration_ms)
+            except OSError as e:
+                # profiling must never break the request itself
+                logger.warning("Failed to save profile: %s", e)
+
+        return response
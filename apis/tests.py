@@ -1,3 +1,248 @@
-from django.test import TestCase
+import cProfile
+import csv
+import gzip
+import importlib.util
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .models import JDRequest
+
+
+class ProfileDownloadTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.profile_dir = Path(tmp.name)
+        override = override_settings(PROFILE_DIR=self.profile_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        profiler = cProfile.Profile()
+        profiler.runcall(sum, range(100))
+        self.name = "1761559200000000000-post-api_jdgen-2500ms.prof"
+        profiler.dump_stats(str(self.profile_dir / self.name))
+
+        staff = get_user_model().objects.create_user("ops", password="x", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(staff)
+
+    def test_raw_download(self):
+        resp = self.client.get(f"/api/profiles/{self.name}/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("attachment", resp["Content-Disposition"])
+        self.assertEqual(b"".join(resp.streaming_content), (self.profile_dir / self.name).read_bytes())
+
+    def test_text_download(self):
+        resp = self.client.get(f"/api/profiles/{self.name}/", {"output": "txt"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("function calls", resp.content.decode())
+
+    def test_non_staff_forbidden(self):
+        user = get_user_model().objects.create_user("dev", password="x")
+        client = APIClient()
+        client.force_authenticate(user)
+        self.assertEqual(client.get(f"/api/profiles/{self.name}/").status_code, 403)
+
+
+class ServerTimingHeaderTests(TestCase):
+    def test_hidden_from_anonymous_callers(self):
+        resp = self.client.get("/api/usage/")
+        self.assertNotIn("Server-Timing", resp)
+
+    def test_sent_to_staff(self):
+        staff = get_user_model().objects.create_user("ops", password="x", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(staff)
+        resp = client.get("/api/usage/")
+        self.assertIn("total;dur=", resp["Server-Timing"])
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_sent_to_everyone_when_enabled(self):
+        resp = self.client.get("/api/usage/")
+        self.assertIn("total;dur=", resp["Server-Timing"])
+
+    @mock.patch("apis.views.call_together_inference", return_value="Senior Backend Engineer\n\nSummary: ...")
+    def test_jdgen_phase_spans(self, _inference):
+        staff = get_user_model().objects.create_user("ops", password="x", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(staff)
+        resp = client.post("/api/jdgen/", {"payload": {"role": "Backend Engineer"}, "word_count": 100}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        spans = [part.split(";")[0].strip() for part in resp["Server-Timing"].split(",")]
+        self.assertEqual(
+            spans, ["auth", "validate", "db_insert", "build_prompt", "upstream", "db_update", "usage_update", "total"]
+        )
+
+
+class SampledProfilingTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.profile_dir = Path(tmp.name)
+
+    def stored(self):
+        return sorted(p.name for p in self.profile_dir.glob("*.prof"))
+
+    def test_saves_dump_above_threshold(self):
+        with self.settings(PROFILE_DIR=self.profile_dir, PROFILE_SAMPLE_RATE=1.0, PROFILE_THRESHOLD_MS=0):
+            self.client.get("/api/usage/")
+        names = self.stored()
+        self.assertEqual(len(names), 1)
+        self.assertIn("-get-api_usage-", names[0])
+
+    def test_skips_dump_below_threshold(self):
+        with self.settings(PROFILE_DIR=self.profile_dir, PROFILE_SAMPLE_RATE=1.0, PROFILE_THRESHOLD_MS=60000):
+            self.client.get("/api/usage/")
+        self.assertEqual(self.stored(), [])
+
+    def test_ring_keeps_newest_files(self):
+        seen = []
+        with self.settings(
+            PROFILE_DIR=self.profile_dir, PROFILE_SAMPLE_RATE=1.0, PROFILE_THRESHOLD_MS=0, PROFILE_MAX_FILES=2
+        ):
+            for _ in range(4):
+                before = set(self.stored())
+                self.client.get("/api/usage/")
+                seen.extend(set(self.stored()) - before)
+        self.assertEqual(self.stored(), sorted(seen[-2:]))
+
+
+class JDRequestAdminTests(TestCase):
+    changelist_url = "/admin/apis/jdrequest/"
+
+    @classmethod
+    def setUpTestData(cls):
+        JDRequest.objects.bulk_create(
+            JDRequest(input_json={"role": f"r{i}"}, output_text="x" * 500, status="complete") for i in range(120)
+        )
+        cls.admin = get_user_model().objects.create_superuser("admin", "admin@example.com", "x")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_older_link_moves_past_current_page(self):
+        first = self.client.get(self.changelist_url)
+        first_ids = [obj.pk for obj in first.context["cl"].result_list]
+        self.assertEqual(first_ids, sorted(first_ids, reverse=True))
+
+        second = self.client.get(self.changelist_url + first.context["older_url"])
+        self.assertEqual(second.status_code, 200)
+        second_ids = [obj.pk for obj in second.context["cl"].result_list]
+        self.assertLess(second_ids[0], first_ids[-1])
+        self.assertIn("newest_url", second.context)
+
+    def test_no_cursor_links_under_custom_ordering(self):
+        resp = self.client.get(self.changelist_url, {"o": "2"})
+        self.assertNotIn("older_url", resp.context)
+
+    def test_count_does_not_read_output_text(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.changelist_url, {"status": "complete"})
+        counts = [q["sql"] for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()]
+        self.assertTrue(counts)
+        for sql in counts:
+            self.assertNotIn("output_text", sql)
+
+
+class JDRequestExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        JDRequest.objects.bulk_create(
+            JDRequest(input_json={"role": f"r{i}"}, output_text=f"jd {i}", status="complete") for i in range(25)
+        )
+        cls.ids = list(JDRequest.objects.order_by("id").values_list("id", flat=True))
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def export(self, *args):
+        call_command("export_jdrequests", *args, stderr=io.StringIO())
+
+    def test_ndjson(self):
+        out = self.tmp / "out.ndjson"
+        self.export("--output", str(out), "--chunk-size", "10")
+        records = [json.loads(line) for line in out.read_text().splitlines()]
+        self.assertEqual([r["id"] for r in records], self.ids)
+        self.assertEqual(records[0]["input_json"], {"role": "r0"})
+
+    def test_csv_gzip(self):
+        out = self.tmp / "out.csv.gz"
+        self.export("--format", "csv", "--gzip", "--output", str(out), "--chunk-size", "10")
+        rows = list(csv.reader(io.StringIO(gzip.decompress(out.read_bytes()).decode())))
+        self.assertEqual(rows[0][0], "id")
+        self.assertEqual([int(r[0]) for r in rows[1:]], self.ids)
+
+    def test_resume_from_cursor_file(self):
+        out, cursor = self.tmp / "out.csv", self.tmp / "cursor"
+        self.export("--format", "csv", "--output", str(out), "--cursor-file", str(cursor),
+                    "--before-id", str(self.ids[10]), "--chunk-size", "4")
+        self.assertEqual(json.loads(cursor.read_text())["last_id"], self.ids[9])
+
+        self.export("--format", "csv", "--output", str(out), "--cursor-file", str(cursor), "--chunk-size", "4")
+        rows = list(csv.reader(out.open()))
+        self.assertEqual(rows[0][0], "id")
+        self.assertEqual([int(r[0]) for r in rows[1:]], self.ids)
+        self.assertEqual(json.loads(cursor.read_text())["last_id"], self.ids[-1])
+
+    def test_resume_discards_half_written_chunk(self):
+        out, cursor = self.tmp / "out.csv.gz", self.tmp / "cursor"
+        self.export("--format", "csv", "--gzip", "--output", str(out), "--cursor-file", str(cursor),
+                    "--before-id", str(self.ids[10]), "--chunk-size", "4")
+        # simulate a run killed between writing a chunk and saving its checkpoint
+        partial_member = gzip.compress(b"999,2025-01-01T00:00:00,complete\n" * 50)
+        with out.open("ab") as f:
+            f.write(partial_member[:len(partial_member) // 2])
+
+        self.export("--format", "csv", "--gzip", "--output", str(out), "--cursor-file", str(cursor), "--chunk-size", "4")
+        rows = list(csv.reader(io.StringIO(gzip.decompress(out.read_bytes()).decode())))
+        self.assertEqual(rows[0][0], "id")
+        self.assertEqual([int(r[0]) for r in rows[1:]], self.ids)
+
+    def test_stdout_output(self):
+        buf = io.BytesIO()
+        call_command("export_jdrequests", "--chunk-size", "10", stdout=buf, stderr=io.StringIO())
+        records = [json.loads(line) for line in buf.getvalue().decode().splitlines()]
+        self.assertEqual([r["id"] for r in records], self.ids)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_parquet_checkpoints_only_complete_files(self):
+        import pyarrow.parquet as pq
+
+        out, cursor = self.tmp / "out.parquet", self.tmp / "cursor"
+        self.export("--format", "parquet", "--output", str(out), "--cursor-file", str(cursor),
+                    "--before-id", str(self.ids[10]), "--chunk-size", "4")
+        self.assertEqual(pq.read_table(out).column("id").to_pylist(), self.ids[:10])
+        self.assertEqual(json.loads(cursor.read_text())["last_id"], self.ids[9])
+        self.assertFalse((self.tmp / "out.parquet.partial").exists())
+
+        self.export("--format", "parquet", "--output", str(out), "--cursor-file", str(cursor), "--chunk-size", "4")
+        part = self.tmp / f"out.after-{self.ids[9]}.parquet"
+        self.assertEqual(pq.read_table(part).column("id").to_pylist(), self.ids[10:])
+
+    def test_endpoint_streams_after_cursor(self):
+        staff = get_user_model().objects.create_user("ops", password="x", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(staff)
+        resp = client.get("/api/exports/jdrequests/", {"after_id": self.ids[19]})
+        self.assertEqual(resp.status_code, 200)
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], self.ids[20:])
+
+    def test_endpoint_staff_only(self):
+        user = get_user_model().objects.create_user("dev", password="x")
+        client = APIClient()
+        client.force_authenticate(user)
+        self.assertEqual(client.get("/api/exports/jdrequests/").status_code, 403)
@@ -28,4 +28,7 @@ urlpatterns += [
     path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
     path('usage/', TotalUsageView.as_view(), name='total-usage'),
+    path("profiles/", ProfileListView.as_view(), name="profile-list"),
+    path("profiles/<str:name>/", ProfileDownloadView.as_view(), name="profile-download"),
+    path("exports/jdrequests/", JDRequestExportView.as_view(), name="jdrequest-export"),
 ]
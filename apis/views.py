@@ -2,6 +2,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 
 from drf_yasg.utils import swagger_auto_schema
@@ -10,6 +11,8 @@ from drf_yasg import openapi
 from .serializers import *
 from .services import build_prompt, call_together_inference
 from .models import *
+from .profiling import timing_span, list_profiles, get_profile_path, render_profile_text
+from .exports import EXPORT_FORMATS, stream_export
 
 
 # Optional: define an Authorization header parameter so Swagger UI shows an auth input box
@@ -48,6 +51,10 @@ class GenerateJDAPIView(APIView):
 
     permission_classes = [permissions.IsAuthenticated]  # adjust as needed
 
+    def perform_authentication(self, request):
+        with timing_span("auth"):
+            super().perform_authentication(request)
+
     @swagger_auto_schema(
         operation_summary="Generate a Job Description",
         operation_description=(
@@ -81,7 +88,8 @@ class GenerateJDAPIView(APIView):
     )
     def post(self, request):
         serializer = JDGenerateSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        with timing_span("validate"):
+            serializer.is_valid(raise_exception=True)
         validated = serializer.validated_data
 
         # debug-friendly print (remove in production)
@@ -94,24 +102,28 @@ class GenerateJDAPIView(APIView):
         language = validated.get("language", "English")
 
         # persist request as pending
-        jd_request = JDRequest.objects.create(
-            input_json=payload,
-            word_count=word_count,
-            tone=tone,
-            language=language,
-            status="pending",
-        )
+        with timing_span("db_insert"):
+            jd_request = JDRequest.objects.create(
+                input_json=payload,
+                word_count=word_count,
+                tone=tone,
+                language=language,
+                status="pending",
+            )
 
-        prompt = build_prompt(payload, word_count=word_count, tone=tone, title=title, language=language)
+        with timing_span("build_prompt"):
+            prompt = build_prompt(payload, word_count=word_count, tone=tone, title=title, language=language)
 
         try:
             # approximate tokens = words * 1.5; cap for safety
             max_tokens = min(4096, int(word_count * 1.5) + 100)
-            generated_text = call_together_inference(prompt, max_tokens=max_tokens, temperature=0.2)
+            with timing_span("upstream"):
+                generated_text = call_together_inference(prompt, max_tokens=max_tokens, temperature=0.2)
 
-            jd_request.output_text = generated_text
-            jd_request.status = "complete"
-            jd_request.save()
+            with timing_span("db_update"):
+                jd_request.output_text = generated_text
+                jd_request.status = "complete"
+                jd_request.save()
 
             response_payload = {
                 "jd_text": generated_text,
@@ -123,12 +135,13 @@ class GenerateJDAPIView(APIView):
             # Validate response shape (optional) before returning
             resp_serializer = JDResponseSerializer(data=response_payload)
             resp_serializer.is_valid(raise_exception=True)
-            usage_obj = TotalUsage.objects.first()
-            if not usage_obj:
-                usage_obj = TotalUsage.objects.create(request_count=1)
-            else:
-                usage_obj.request_count += 1
-                usage_obj.save()
+            with timing_span("usage_update"):
+                usage_obj = TotalUsage.objects.first()
+                if not usage_obj:
+                    usage_obj = TotalUsage.objects.create(request_count=1)
+                else:
+                    usage_obj.request_count += 1
+                    usage_obj.save()
 
             return Response(resp_serializer.data, status=status.HTTP_200_OK)
 
@@ -178,3 +191,128 @@ class TotalUsageView(APIView):
             return Response({"detail": "Usage record not found"}, status=404)
         serializer = TotalUsageSerializer(usage)
         return Response(serializer.data)
+
+
+class ProfileListView(APIView):
+    """
+    GET /api/profiles/
+    Lists the sampled slow-request profiles kept in the on-disk ring (staff only).
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="List slow-request profiles",
+        operation_description=(
+            "Returns the cProfile dumps captured for sampled requests slower than "
+            "`PROFILE_THRESHOLD_MS`, newest first."
+        ),
+        manual_parameters=[auth_header],
+        responses={
+            200: openapi.Response(
+                description="Stored profiles",
+                examples={
+                    "application/json": [
+                        {"name": "1761559200000000000-post-api_jdgen-8421ms.prof", "size": 48213, "created_at": 1761559200.0}
+                    ]
+                },
+            ),
+            403: "Staff permission required",
+        },
+        tags=["Diagnostics"],
+    )
+    def get(self, request):
+        return Response(list_profiles())
+
+
+class ProfileDownloadView(APIView):
+    """
+    GET /api/profiles/<name>/
+    Downloads a stored profile as a raw pstats dump, or as text with `?output=txt`.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="Download a slow-request profile",
+        manual_parameters=[
+            auth_header,
+            openapi.Parameter(
+                name="output",
+                in_=openapi.IN_QUERY,
+                description="`txt` for a cumulative-time summary; omit for the raw pstats file",
+                type=openapi.TYPE_STRING,
+            ),
+        ],
+        responses={
+            200: "Profile file",
+            403: "Staff permission required",
+            404: "Profile not found",
+        },
+        tags=["Diagnostics"],
+    )
+    def get(self, request, name):
+        path = get_profile_path(name)
+        if path is None:
+            return Response({"detail": "Profile not found"}, status=404)
+        if request.query_params.get("output") == "txt":
+            return HttpResponse(render_profile_text(path), content_type="text/plain; charset=utf-8")
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=name)
+
+
+class JDRequestExportView(APIView):
+    """
+    GET /api/exports/jdrequests/
+    Streams JDRequest history as NDJSON or CSV (staff only). Rows are read in
+    keyset chunks ordered by id; pass the last exported id as `after_id` to resume.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="Export JD generation history",
+        operation_description=(
+            "Streams every `JDRequest` in id order without loading the table into memory. "
+            "If a download is interrupted, resume with `after_id` set to the last `id` received."
+        ),
+        manual_parameters=[
+            auth_header,
+            openapi.Parameter("export_format", openapi.IN_QUERY, description="`ndjson` (default) or `csv`", type=openapi.TYPE_STRING),
+            openapi.Parameter("gzip", openapi.IN_QUERY, description="`1` to gzip the stream", type=openapi.TYPE_BOOLEAN),
+            openapi.Parameter("after_id", openapi.IN_QUERY, description="Resume cursor: export rows with id greater than this", type=openapi.TYPE_INTEGER),
+            openapi.Parameter("before_id", openapi.IN_QUERY, description="Export rows with id less than this", type=openapi.TYPE_INTEGER),
+            openapi.Parameter("status", openapi.IN_QUERY, description="pending / complete / failed", type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: "Streamed export file",
+            400: "Invalid query parameters",
+            403: "Staff permission required",
+        },
+        tags=["Exports"],
+    )
+    def get(self, request):
+        params = request.query_params
+        export_format = params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return Response({"detail": f"export_format must be one of {', '.join(EXPORT_FORMATS)}"}, status=400)
+        try:
+            after_id = int(params.get("after_id") or 0)
+            before_id = int(params["before_id"]) if params.get("before_id") else None
+        except ValueError:
+            return Response({"detail": "after_id and before_id must be integers"}, status=400)
+        compress = params.get("gzip") in ("1", "true")
+
+        filename = f"jdrequests.{export_format}" + (".gz" if compress else "")
+        content_type = "application/x-ndjson" if export_format == "ndjson" else "text/csv"
+        response = StreamingHttpResponse(
+            stream_export(
+                export_format,
+                compress=compress,
+                after_id=after_id,
+                before_id=before_id,
+                status=params.get("status") or None,
+            ),
+            content_type="application/gzip" if compress else content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
@@ -52,6 +52,7 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    "apis.profiling.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -169,3 +170,10 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ),
 }
+
+# Server-Timing header and sampled slow-request profiling (see apis/profiling.py)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "0") == "1"  # staff users always get the header
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # e.g. 0.05 profiles 5% of requests
+PROFILE_THRESHOLD_MS = 2000
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+PROFILE_MAX_FILES = 50